@@ -2,30 +2,44 @@ import os
 import re
 import math
 import csv
-import uuid
+import functools
+import itertools
+import operator
+import multiprocessing
+import secrets
 import datetime as dt
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
 import pandas as pd
+import xlsxwriter
 from jinja2 import Template
-from weasyprint import HTML
+from weasyprint import CSS, HTML
+from weasyprint.text.fonts import FontConfiguration
 
 
 # =========================
 # Helpers
 # =========================
 
+# Compiled once: these run for every row / every bill
+_FN_BAD = re.compile(r'[\\/:*?"<>|]+')
+_WS = re.compile(r"\s+")
+_NONDIGIT = re.compile(r"\D")
+_DIGITS = re.compile(r"(\d+)")
+
+@functools.lru_cache(maxsize=1024)  # rate / other cost repeat for every bill in a batch
 def money_usd(x: float) -> str:
     return f"${x:,.2f}"
 
 
-
+@functools.lru_cache(maxsize=1024)  # placeholder names ("UNKNOWN") repeat; phones are one per bill
 def safe_filename(s: str) -> str:
     s = (s or "").strip()
-    s = re.sub(r'[\\/:*?"<>|]+', " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
+    s = _FN_BAD.sub(" ", s)
+    s = _WS.sub(" ", s).strip()
     return s[:180] if len(s) > 180 else s
 
 def parse_phone_name(value: Any) -> tuple[Optional[str], Optional[str]]:
@@ -37,10 +51,10 @@ def parse_phone_name(value: Any) -> tuple[Optional[str], Optional[str]]:
         return None, None
     if " " in s:
         first, rest = s.split(" ", 1)
-        phone = re.sub(r"\D", "", first)
+        phone = _NONDIGIT.sub("", first)
         name = rest.strip() or None
         return (phone or None), name
-    phone = re.sub(r"\D", "", s)
+    phone = _NONDIGIT.sub("", s)
     return (phone or None), None
 
 def normalize_shipping_mark(value: Any) -> Optional[str]:
@@ -50,15 +64,15 @@ def normalize_shipping_mark(value: Any) -> Optional[str]:
     if not s:
         return None
     # Some cells have multiple numbers separated by spaces; take the first token
-    return s.split()[0].strip() or None
+    # (split once instead of tokenizing the whole cell)
+    return _WS.split(s, maxsplit=1)[0] or None
 
 def parse_item_description(value: str) -> str:
     """Parse column D value (like '1pallet', '10', '1', etc.) into formatted description."""
     value = value.strip().lower()
     
     # Try to extract number
-    import re
-    match = re.search(r'(\d+)', value)
+    match = _DIGITS.search(value)
     quantity = int(match.group(1)) if match else 1
     
     # Determine the unit
@@ -81,7 +95,9 @@ def is_container_header_line(colA: Any) -> bool:
     return ("N005=" in s) or ("N006=" in s)
 
 
-@dataclass
+# frozen: the derived amounts/strings below are computed once, so the inputs
+# must not change afterwards (build a new Bill, e.g. dataclasses.replace, instead)
+@dataclass(slots=True, frozen=True)
 class Bill:
     shipping_mark: str
     customer_id: Optional[str]
@@ -95,20 +111,40 @@ class Bill:
     item_description: str
     breakdown_items: List[Dict[str, Any]] = field(default_factory=list)
 
-    @property
-    def subtotal_usd(self) -> float:
+    # Derived amounts, computed once: PDF, WhatsApp CSV and Summary all read them
+    subtotal_usd: float = field(init=False)
+    min_charge_usd: float = field(init=False, default=0.0)
+    total_usd: float = field(init=False)
+    # Invoice template variables except invoice_no / invoice_date (see render_pdf_for_bill)
+    render_context: Dict[str, Any] = field(init=False, repr=False)
+
+    def __post_init__(self):
         # Fixed charge for small CBM
         if math.isclose(self.total_cbm, 0.01, abs_tol=1e-9):
-            return 3.00
-        return self.rate_usd_per_cbm * self.total_cbm
-
-    @property
-    def min_charge_usd(self) -> float:
-        return 0.0
-
-    @property
-    def total_usd(self) -> float:
-        return float(round(self.subtotal_usd + self.other_cost_usd))
+            subtotal_usd = 3.00
+        else:
+            subtotal_usd = self.rate_usd_per_cbm * self.total_cbm
+        total_usd = float(round(subtotal_usd + self.other_cost_usd))
+        # object.__setattr__: the dataclass is frozen
+        object.__setattr__(self, "subtotal_usd", subtotal_usd)
+        object.__setattr__(self, "total_usd", total_usd)
+
+        object.__setattr__(self, "render_context", dict(
+            customer_name=self.customer_name,
+            location=self.location,
+            phone=self.phone,
+            item_description=self.item_description,
+            rate_usd_str=money_usd(self.rate_usd_per_cbm),
+            cbm_str=f"{self.total_cbm:.2f}",
+            # payment details line exactly like sample: "240*0.42"
+            payment_details=f"{int(self.rate_usd_per_cbm)}*{self.total_cbm:.2f}",
+            subtotal_usd_str=money_usd(subtotal_usd),
+            other_cost_usd_str=money_usd(self.other_cost_usd),
+            total_usd_str=money_usd(total_usd),
+            # shipping_mark=self.shipping_mark,
+            shipping_mark=self.shipping_mark.replace(", ", "\n"),
+            breakdown_items=self.breakdown_items,
+        ))
 
 
 
@@ -117,14 +153,23 @@ class Bill:
 # Parsing Excel
 # =========================
 
+# Sheet columns we actually use; everything else is skipped by the reader
+_SOURCE_COLUMNS = {
+    'INVOICE N0.', 'TRACKING N0.', 'CONTACT', 'CUSTOMER NAME', 'LOCATION',
+    'QTY PER TRACKING', 'CBM PER TRACKING', 'PRODUCT DESCRIPTION', 'RECEIVING DATE',
+}
 def load_and_prepare_rows(excel_path: Path) -> pd.DataFrame:
     # Read with header row 3 (0-indexed)
     # Rows 0-2 contain: empty row, container info 1, container info 2
     # So we use header=3
-    df = pd.read_excel(excel_path, sheet_name=0, header=3)
+    # calamine (Rust) parses .xlsx/.xls far faster than openpyxl
+    df = pd.read_excel(excel_path, sheet_name=0, header=3, engine="calamine",
+                       usecols=lambda c: str(c).strip() in _SOURCE_COLUMNS,
+                       # Whole sheet as text so e.g. phone numbers in CONTACT don't come
+                       # back as floats ("540789320.0"), whatever padding the headers
+                       # have; CBM is made numeric below
+                       dtype=str)
 
-    # Filter: keep only rows with tracking numbers
-    # Column "TRACKING N0."
     # If column names differ slightly (e.g. spaces), clean them first?
     # Let's clean column names by stripping spaces just in case
     df.columns = [str(c).strip() for c in df.columns]
@@ -133,8 +178,6 @@ def load_and_prepare_rows(excel_path: Path) -> pd.DataFrame:
         # Fallback or error?
         pass
 
-    df = df[df['TRACKING N0.'].notna()].copy()
-
     # Column Mapping
     # INVOICE N0. -> INVOICE_NO
     # TRACKING N0. -> TRACKING_NO
@@ -165,28 +208,29 @@ def load_and_prepare_rows(excel_path: Path) -> pd.DataFrame:
         if c not in df.columns:
             df[c] = None
 
+    # Filter: keep only rows with tracking numbers (applied in the final
+    # selection below, so the frame is copied once; taken before cleaning
+    # turns missing values into text)
+    has_tracking = df['TRACKING_NO'].notna()
+
     # Handle defaults / cleaning
     df['CONTACT'] = df['CONTACT'].fillna('UNKNOWN').astype(str)
     df['CUSTOMER_NAME'] = df['CUSTOMER_NAME'].fillna('UNKNOWN')
     df['LOCATION'] = df['LOCATION'].fillna('ACCRA GHANA')
+    # Clean tracking numbers once for the whole column instead of per row in build_bills
+    df['TRACKING_NO'] = df['TRACKING_NO'].astype(str).str.strip()
     
     # Ensure CBM is numeric
     df['CBM'] = pd.to_numeric(df['CBM'], errors='coerce').fillna(0.0)
 
-    # Parse QTY_PER_TRACKING (e.g., "1pallet" -> 1, "4" -> 4)
-    def parse_qty(qty_str):
-        if pd.isna(qty_str):
-            return 1
-        qty_str = str(qty_str).strip().lower()
-        # Extract numeric part
-        import re
-        match = re.search(r'\d+', qty_str)
-        return int(match.group()) if match else 1
-
-    df['QTY'] = df['QTY_PER_TRACKING'].apply(parse_qty)
+    # Parse QTY_PER_TRACKING (e.g., "1pallet" -> 1, "4" -> 4); blanks count as 1
+    df['QTY'] = (df['QTY_PER_TRACKING'].astype(str)
+                 .str.extract(r"(\d+)", expand=False)
+                 .fillna('1')
+                 .astype(int))
 
-    work = df[['CONTACT', 'CUSTOMER_NAME', 'LOCATION', 'TRACKING_NO', 'CBM', 
-               'PRODUCT_DESCRIPTION', 'INVOICE_NO', 'QTY', 'RECEIVING_DATE']].copy()
+    work = df.loc[has_tracking, ['CONTACT', 'CUSTOMER_NAME', 'LOCATION', 'TRACKING_NO', 'CBM', 
+                                 'PRODUCT_DESCRIPTION', 'INVOICE_NO', 'QTY', 'RECEIVING_DATE']]
     return work
 
 
@@ -200,54 +244,70 @@ def build_bills(df: pd.DataFrame,
     # Group by CONTACT (customer phone number identifier)
     grouped = df.groupby('CONTACT', dropna=False)
 
-    for contact, g in grouped:
-        # Customer info (direct from columns, no parsing)
-        # Handle cases where NAME might be inconsistent in the group (take first valid)
-        customer_name = g['CUSTOMER_NAME'].iloc[0] if g['CUSTOMER_NAME'].notna().any() and g['CUSTOMER_NAME'].iloc[0] != "UNKNOWN" else "UNKNOWN"
-        # If the first row was UNKNOWN but later rows had a name, we might miss it with .iloc[0] if we don't sort or filter?
-        # Better: find first non-UNKNOWN name
-        valid_names = [x for x in g['CUSTOMER_NAME'].unique() if x != "UNKNOWN"]
-        if valid_names:
-            customer_name = valid_names[0]
-            
-        location = g['LOCATION'].iloc[0] if g['LOCATION'].notna().any() else location_default
-        # Similar logic for location?
-        valid_locs = [x for x in g['LOCATION'].unique() if x != "ACCRA GHANA" and x is not None]
-        if valid_locs:
-            location = valid_locs[0]
-        else:
-             # Default is already set but just to be sure
-             if location == "ACCRA GHANA" or location is None:
-                 location = "ACCRA GHANA"
-        
+    qty = df['QTY'].fillna(1).astype(int)
+
+    # Customer info and totals for every group in one pass. Placeholder
+    # names/locations are masked out so 'first' picks the first real value
+    # (names can be inconsistent within a group, e.g. UNKNOWN on the first row only).
+    summary = df.assign(
+        CUSTOMER_NAME=df['CUSTOMER_NAME'].where(df['CUSTOMER_NAME'] != "UNKNOWN"),
+        LOCATION=df['LOCATION'].where(df['LOCATION'] != "ACCRA GHANA"),
+        QTY=qty,
+    ).groupby('CONTACT', dropna=False).agg(
+        customer_name=('CUSTOMER_NAME', 'first'),
+        location=('LOCATION', 'first'),
+        total_cbm=('CBM', 'sum'),
+        total_qty=('QTY', 'sum'),
+    )
+    customer_names = summary['customer_name'].fillna("UNKNOWN").to_dict()
+    locations = summary['location'].fillna(location_default).to_dict()
+    total_cbms = summary['total_cbm'].to_dict()
+    total_qtys = summary['total_qty'].to_dict()
+
+    # Breakdown items: one per tracking number, built for all rows at once and
+    # sliced per group by position.
+    records = pd.DataFrame({
+        "tracking_number": df['TRACKING_NO'].fillna("NO_TRACKING").astype(str).str.strip(),
+        "quantity": qty,
+        "cbm": df['CBM'].fillna(0.0).round(2),
+    }).to_dict('records')
+    group_rows = grouped.indices
+
+    # Shipping mark: the customer's tracking numbers joined, computed for all groups at once
+    # (grouped by column name, not by a separate Series, so duplicate index labels in the
+    # caller's frame are fine; cast too: callers may pass non-string tracking numbers)
+    marks = df.loc[df['TRACKING_NO'].notna(), ['CONTACT', 'TRACKING_NO']]
+    shipping_marks = (marks.assign(TRACKING_NO=marks['TRACKING_NO'].astype(str))
+                      .groupby('CONTACT', dropna=False)['TRACKING_NO']
+                      .agg(", ".join)
+                      .to_dict())
+
+    # Distinct product descriptions per customer, in order of appearance, stripped once
+    descs = (df[['CONTACT', 'PRODUCT_DESCRIPTION']]
+             .dropna(subset=['PRODUCT_DESCRIPTION'])
+             .drop_duplicates())
+    descs = descs.assign(PRODUCT_DESCRIPTION=descs['PRODUCT_DESCRIPTION'].astype(str).str.strip())
+    descs = descs[descs['PRODUCT_DESCRIPTION'] != ""]
+    product_descs_by_contact = (descs.groupby('CONTACT', dropna=False)['PRODUCT_DESCRIPTION']
+                                .agg(list)
+                                .to_dict())
+
+    for contact in summary.index:
+        customer_name = customer_names[contact]
+        location = locations[contact]
         phone = str(contact)
-        
+
         # Total CBM for this customer
-        total_cbm = float(g['CBM'].sum())
+        total_cbm = float(total_cbms[contact])
 
-        # Build breakdown items: one per tracking number
-        breakdown_items = []
-        
-        for idx, row in g.iterrows():
-            tracking = str(row['TRACKING_NO']).strip() if pd.notna(row['TRACKING_NO']) else "NO_TRACKING"
-            cbm = float(row['CBM']) if pd.notna(row['CBM']) else 0.0
-            qty = int(row['QTY']) if pd.notna(row['QTY']) else 1
-            
-            breakdown_items.append({
-                "tracking_number": tracking,
-                "quantity": qty,
-                "cbm": round(cbm, 2)
-            })
+        breakdown_items = [records[i] for i in group_rows[contact]]
 
         # Build item description from PRODUCT_DESCRIPTION
-        product_descs = [str(x).strip() for x in g['PRODUCT_DESCRIPTION'].dropna().unique().tolist() if str(x).strip()]
+        product_descs = product_descs_by_contact.get(contact, [])
         
         # Count total items (sum of QTY)
-        # Note: Previous plan said "count number of rows", but prompt says "For quantity in breakdown: use parsed QTY column"
-        # And item desc says "Count number of rows (shipments) for quantity" in ONE part, but then "use parsed QTY" in another?
-        # Let's align with: Item Desc usually aggregates TOTAL PACKAGES.
-        # So we should sum breakdown quantities.
-        total_qty = sum(item['quantity'] for item in breakdown_items)
+        # Item Desc aggregates TOTAL PACKAGES, i.e. the breakdown quantities summed.
+        total_qty = int(total_qtys[contact])
         unit = "CARTON" if total_qty == 1 else "CARTONS"
         
         if product_descs:
@@ -260,8 +320,7 @@ def build_bills(df: pd.DataFrame,
             item_desc = f"{total_qty} {unit} OF PERSONAL USE"
 
         # Combine all tracking numbers for shipping_mark field
-        tracking_numbers = [str(x) for x in g['TRACKING_NO'].dropna().tolist()]
-        shipping_mark = ", ".join(tracking_numbers) if tracking_numbers else "NO_TRACKING"
+        shipping_mark = shipping_marks.get(contact, "NO_TRACKING")
 
         bills.append(Bill(
             shipping_mark=shipping_mark,
@@ -285,87 +344,137 @@ def build_bills(df: pd.DataFrame,
 # PDF + Exports
 # =========================
 
-def render_pdf_for_bill(bill: Bill, template_html: str, out_path: Path,
-                        invoice_no: str, invoice_date: str) -> None:
+def render_pdf_for_bill(bill: Bill, template: Template, out_path: Path,
+                        invoice_no: str, invoice_date: str,
+                        font_config: Optional[FontConfiguration] = None,
+                        stylesheets: Optional[List[CSS]] = None,
+                        cache: Optional[Dict[Any, Any]] = None) -> None:
+    """Render one bill; `template`, `font_config`, the parsed `stylesheets`
+    (template_invoice.css) and the image `cache` are created once by the caller
+    and reused across bills, as is `out_path`'s folder. Without `stylesheets`,
+    template_invoice.css is parsed for this call (the template has no <style>)."""
 
-    # payment details line exactly like sample: "240*0.42"
-    payment_details = f"{int(bill.rate_usd_per_cbm)}*{bill.total_cbm:.2f}"
+    if stylesheets is None:
+        stylesheets = [CSS(filename="template_invoice.css", font_config=font_config)]
 
-    html = Template(template_html).render(
-        invoice_no=invoice_no,
-        invoice_date=invoice_date,
-        customer_name=bill.customer_name,
-        location=bill.location,
-        phone=bill.phone,
-        item_description=bill.item_description,
-        rate_usd_str=money_usd(bill.rate_usd_per_cbm),
-        cbm_str=f"{bill.total_cbm:.2f}",
-        payment_details=payment_details,
-        subtotal_usd_str=money_usd(bill.subtotal_usd),
-        other_cost_usd_str=money_usd(bill.other_cost_usd),
-        total_usd_str=money_usd(bill.total_usd),
-        # shipping_mark=bill.shipping_mark,
-        shipping_mark=bill.shipping_mark.replace(", ", "\n"),
-        breakdown_items=bill.breakdown_items
+    html = template.render(**bill.render_context, invoice_no=invoice_no, invoice_date=invoice_date)
 
-    )
-
-    out_path.parent.mkdir(parents=True, exist_ok=True)
     # base_url="." allows WeasyPrint to find "logo.png" in the current directory
-    HTML(string=html, base_url=".").write_pdf(str(out_path))
-
+    # Layout (render) and serialization (write_pdf) are separate steps so the
+    # shared font_config / stylesheets / cache are used explicitly for the layout pass
+    document = HTML(string=html, base_url=".").render(font_config=font_config,
+                                                      stylesheets=stylesheets, cache=cache)
+    document.write_pdf(str(out_path))
+
+
+_WHATSAPP_TMPL = (
+    "I&C CARGO – GOODS BILL\n"
+    "Name: {name}\n"
+    "Phone: {phone}\n"
+    "Shipping Mark: {shipping_mark}\n"
+    "Total CBM: {cbm:.2f}\n"
+    "Rate: {rate}/CBM → {rate_int} * {cbm:.2f} = {subtotal}\n"
+    "Other Cost: {other_cost}\n"
+    "Total: {total}\n"
+)
 
 def make_whatsapp_message(bill: Bill) -> str:
-    calc_usd = bill.subtotal_usd
-    payment_line = f"{int(bill.rate_usd_per_cbm)} * {bill.total_cbm:.2f} = {money_usd(calc_usd)}"
-
-    msg = (
-        "I&C CARGO – GOODS BILL\n"
-        f"Name: {bill.customer_name}\n"
-        f"Phone: {bill.phone}\n"
-        f"Shipping Mark: {bill.shipping_mark}\n"
-        f"Total CBM: {bill.total_cbm:.2f}\n"
-        f"Rate: {money_usd(bill.rate_usd_per_cbm)}/CBM → {payment_line}\n"
-        f"Other Cost: {money_usd(bill.other_cost_usd)}\n"
-        f"Total: {money_usd(bill.total_usd)}\n"
+    ctx = bill.render_context  # same money strings as the PDF
+    return _WHATSAPP_TMPL.format(
+        name=bill.customer_name,
+        phone=bill.phone,
+        shipping_mark=bill.shipping_mark,
+        cbm=bill.total_cbm,
+        rate=ctx["rate_usd_str"],
+        rate_int=int(bill.rate_usd_per_cbm),
+        subtotal=ctx["subtotal_usd_str"],
+        other_cost=ctx["other_cost_usd_str"],
+        total=ctx["total_usd_str"],
     )
-    return msg
 
 
+_SUMMARY_COLUMNS = ["ShippingMark", "CustomerName", "Phone", "TotalCBM", "Rate_USD_per_CBM",
+                    "Subtotal_USD", "OtherCost_USD", "Total_USD"]
+# One C-level call per bill yields the row tuple in _SUMMARY_COLUMNS order
+_summary_row = operator.attrgetter("shipping_mark", "customer_name", "phone", "total_cbm",
+                                   "rate_usd_per_cbm", "subtotal_usd", "other_cost_usd", "total_usd")
+
 def export_summary_xlsx(bills: List[Bill], out_xlsx: Path) -> None:
-    rows = []
-    for b in bills:
-        rows.append({
-            "ShippingMark": b.shipping_mark,
-            "CustomerName": b.customer_name,
-            "Phone": b.phone,
-            "TotalCBM": b.total_cbm,
-            "Rate_USD_per_CBM": b.rate_usd_per_cbm,
-            "Subtotal_USD": b.subtotal_usd,
-            "OtherCost_USD": b.other_cost_usd,
-            "Total_USD": b.total_usd,
+    # xlsxwriter directly in constant_memory mode: each row is flushed to disk
+    # once the next one starts instead of buffering the whole sheet. (pandas'
+    # to_excel writes column by column, which constant_memory cannot handle.)
+    with xlsxwriter.Workbook(str(out_xlsx), {"constant_memory": True}) as wb:
+        ws = wb.add_worksheet("Summary")
+        # Same header look as pandas' to_excel
+        header_fmt = wb.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+        ws.write_row(0, 0, _SUMMARY_COLUMNS, header_fmt)
+        for i, row in enumerate(map(_summary_row, bills), start=1):
+            ws.write_row(i, 0, row)
 
-        })
-    df = pd.DataFrame(rows)
-    out_xlsx.parent.mkdir(parents=True, exist_ok=True)
-    with pd.ExcelWriter(out_xlsx, engine="xlsxwriter") as writer:
-        df.to_excel(writer, index=False, sheet_name="Summary")
 
 
+def _whatsapp_rows(bills: List[Bill]):
+    # Generator: only one bill's message is held in memory at a time
+    for b in bills:
+        yield (b.phone, b.shipping_mark, b.customer_name, make_whatsapp_message(b))
+
 
 def export_whatsapp_csv(bills: List[Bill], out_csv: Path) -> None:
-    out_csv.parent.mkdir(parents=True, exist_ok=True)
-    with open(out_csv, "w", newline="", encoding="utf-8") as f:
+    # 1 MB buffer: the whole CSV typically goes out in a handful of writes
+    with open(out_csv, "w", newline="", encoding="utf-8", buffering=1024 * 1024) as f:
         w = csv.writer(f)
         w.writerow(["Phone", "ShippingMark", "CustomerName", "Message"])
-        for b in bills:
-            w.writerow([b.phone, b.shipping_mark, b.customer_name, make_whatsapp_message(b)])
+        w.writerows(_whatsapp_rows(bills))
+
+
+def invoice_numbers(year: str):
+    """Invoice number: "1C" + year + 8 digits, unique per bill within a run (can
+    be changed to your exact sequence later). One random starting serial per
+    run, then consecutive, instead of a datetime + uuid4 call for every bill."""
+    prefix = "1C" + year
+    for serial in itertools.count(secrets.randbelow(10 ** 8)):
+        yield f"{prefix}{serial % 10 ** 8:08d}"
+
+
+# =========================
+# Parallel PDF rendering
+# =========================
+
+# Per-process render state, filled once by the pool initializer so the
+# template, CSS and font setup are neither re-pickled nor rebuilt with every task.
+_WORKER_STATE: Dict[str, Any] = {}
+
+# Renders kept in flight per worker: enough that no worker waits for its
+# next task, while the executor holds a Future per in-flight task only
+RENDER_IN_FLIGHT_PER_WORKER = 4
+
+
+def _init_render_worker(template_html: str, template_css: str) -> None:
+    _WORKER_STATE["template"] = Template(template_html)
+    font_config = FontConfiguration()
+    _WORKER_STATE["font_config"] = font_config
+    _WORKER_STATE["stylesheets"] = [CSS(string=template_css, font_config=font_config)]
+    # WeasyPrint keeps decoded images (logo.png) here, so they are loaded once per worker
+    _WORKER_STATE["cache"] = {}
+
+
+def _render_one(task: tuple) -> Path:
+    """Pool task: (bill, out_pdf, invoice_no, invoice_date) -> rendered PDF path."""
+    bill, out_pdf, invoice_no, invoice_date = task
+    render_pdf_for_bill(bill, _WORKER_STATE["template"], out_pdf,
+                        invoice_no=invoice_no, invoice_date=invoice_date,
+                        font_config=_WORKER_STATE["font_config"],
+                        stylesheets=_WORKER_STATE["stylesheets"],
+                        cache=_WORKER_STATE["cache"])
+    return out_pdf
 
 
 # =========================
 # GUI (Tkinter)
 # =========================
 
+import queue
+import threading
 import tkinter as tk
 from tkinter import filedialog, messagebox
 
@@ -386,7 +495,11 @@ class App(tk.Tk):
         now_str = dt.datetime.now().strftime("%dTH %b, %Y").upper()
         self.date_var = tk.StringVar(value=now_str)
 
+        # Log lines and pipeline results from any thread; drained on the Tk thread
+        self._log_q = queue.Queue()
+
         self._build()
+        self.after(250, self._drain_log)
 
     def _build(self):
         pad = 10
@@ -418,7 +531,8 @@ class App(tk.Tk):
         tk.Entry(frm, textvariable=self.date_var, width=20).grid(row=row, column=1, sticky="w", pady=(8,0))
 
         row += 1
-        tk.Button(frm, text="Generate", command=self.generate, width=20, height=2).grid(row=row, column=1, sticky="w", pady=(18,0))
+        self.generate_btn = tk.Button(frm, text="Generate", command=self.generate, width=20, height=2)
+        self.generate_btn.grid(row=row, column=1, sticky="w", pady=(18,0))
 
         row += 1
         self.log = tk.Text(frm, height=10, width=90)
@@ -436,9 +550,39 @@ class App(tk.Tk):
         webbrowser.open("mailto:drqrack@gmail.com")
 
     def _log(self, msg: str):
-        self.log.insert("end", msg + "\n")
-        self.log.see("end")
-        self.update_idletasks()
+        # Safe from any thread: the widget is only touched in _drain_log
+        self._log_q.put(("log", msg))
+
+    def _drain_log(self) -> None:
+        """Tk thread: flush queued log lines in one insert and handle pipeline done/error, ~4x/s."""
+        pending = []
+        while True:
+            try:
+                kind, payload = self._log_q.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "log":
+                pending.append(payload)
+            elif kind == "done":
+                n_bills, run_dir = payload
+                pending.append(f"Done. Output folder: {run_dir}")
+                self._flush_log(pending)
+                pending = []
+                self.generate_btn.config(state="normal")
+                messagebox.showinfo("Done", f"Generated {n_bills} PDFs + WhatsApp CSV + Summary.xlsx\n\n{run_dir}")
+            elif kind == "error":
+                pending.append(f"Failed: {payload}")
+                self._flush_log(pending)
+                pending = []
+                self.generate_btn.config(state="normal")
+                messagebox.showerror("Error", f"Generation failed:\n\n{payload}")
+        self._flush_log(pending)
+        self.after(250, self._drain_log)
+
+    def _flush_log(self, lines: List[str]) -> None:
+        if lines:
+            self.log.insert("end", "\n".join(lines) + "\n")
+            self.log.see("end")
 
     def select_excel(self):
         p = filedialog.askopenfilename(
@@ -481,44 +625,93 @@ class App(tk.Tk):
             messagebox.showerror("Error", "Missing template_invoice.html (must be in same folder as app.py).")
             return
 
-        self._log(f"Loading Excel: {excel_path.name}")
-        df = load_and_prepare_rows(excel_path)
-        self._log(f"Rows loaded: {len(df)}")
-
-        bills = build_bills(df, rate_usd_per_cbm=rate, other_cost_usd=other_cost)
-
-        run_stamp = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
-        run_dir = out_dir / f"IC_OUTPUT_{run_stamp}"
-        pdf_dir = run_dir / "PDFs"
-
-        self._log(f"Generating {len(bills)} bills...")
+        try:
+            template_css = Path("template_invoice.css").read_text(encoding="utf-8")
+        except Exception:
+            messagebox.showerror("Error", "Missing template_invoice.css (must be in same folder as app.py).")
+            return
 
         # invoice_date = dt.datetime.now().strftime("%dTH %b, %Y").upper()
         # Use user input date
         invoice_date = self.date_var.get().strip().upper()
 
-        for i, b in enumerate(bills, start=1):
-            # Invoice number: simple unique per bill (can be changed to your exact sequence later)
-            invoice_no = "1C" + dt.datetime.now().strftime("%Y") + str(uuid.uuid4().int)[0:8]
-
-            name_part = safe_filename(b.customer_name) or "UNKNOWN"
-            phone_part = safe_filename(b.phone) or "NO_PHONE"
-            # ship_part = safe_filename(b.shipping_mark) or "NO_SHIPPING_MARK"
-
-            # pdf_name = f"{ship_part} - {name_part} - {phone_part}.pdf"
-            pdf_name = f"CUSTOMER - {name_part} - {phone_part}.pdf"
-            out_pdf = pdf_dir / pdf_name
-
-            render_pdf_for_bill(b, template_html, out_pdf, invoice_no=invoice_no, invoice_date=invoice_date)
-
-            if i % 20 == 0:
-                self._log(f"... {i}/{len(bills)} PDFs done")
-
-        export_whatsapp_csv(bills, run_dir / "WhatsApp_Messages.csv")
-        export_summary_xlsx(bills, run_dir / "Summary.xlsx")
-
-        self._log(f"Done. Output folder: {run_dir}")
-        messagebox.showinfo("Done", f"Generated {len(bills)} PDFs + WhatsApp CSV + Summary.xlsx\n\n{run_dir}")
+        # Run the pipeline off the Tk thread so the window stays responsive;
+        # the worker only talks back through self._log_q (Tk is not thread-safe).
+        self.generate_btn.config(state="disabled")
+        threading.Thread(
+            target=self._pipeline,
+            args=(excel_path, out_dir, rate, other_cost, template_html, template_css, invoice_date),
+            daemon=True,
+        ).start()
+
+    def _pipeline(self, excel_path: Path, out_dir: Path,
+                  rate: float, other_cost: float, template_html: str, template_css: str,
+                  invoice_date: str) -> None:
+        """Background thread: Excel -> bills -> PDFs + exports. Logs via self._log,
+        then posts ("done", (n_bills, run_dir)) or ("error", msg) to self._log_q."""
+        try:
+            self._log(f"Loading Excel: {excel_path.name}")
+            df = load_and_prepare_rows(excel_path)
+            self._log(f"Rows loaded: {len(df)}")
+
+            bills = build_bills(df, rate_usd_per_cbm=rate, other_cost_usd=other_cost)
+
+            run_stamp = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
+            run_dir = out_dir / f"IC_OUTPUT_{run_stamp}"
+            pdf_dir = run_dir / "PDFs"
+            # Created once here (also creates run_dir); the render/export helpers don't mkdir
+            pdf_dir.mkdir(parents=True, exist_ok=True)
+
+            self._log(f"Generating {len(bills)} bills...")
+
+            invoice_nos = invoice_numbers(dt.datetime.now().strftime("%Y"))
+
+            tasks = []
+            for b, invoice_no in zip(bills, invoice_nos):
+
+                name_part = safe_filename(b.customer_name) or "UNKNOWN"
+                phone_part = safe_filename(b.phone) or "NO_PHONE"
+                # ship_part = safe_filename(b.shipping_mark) or "NO_SHIPPING_MARK"
+
+                # pdf_name = f"{ship_part} - {name_part} - {phone_part}.pdf"
+                pdf_name = f"CUSTOMER - {name_part} - {phone_part}.pdf"
+                out_pdf = pdf_dir / pdf_name
+
+                tasks.append((b, out_pdf, invoice_no, invoice_date))
+
+            # WeasyPrint is CPU-bound, so render on all cores; progress is
+            # reported from here as workers finish. Each worker pays the
+            # WeasyPrint start-up cost, so never start more than there are bills.
+            workers = max(1, min(os.cpu_count() or 1, len(tasks)))
+            with ProcessPoolExecutor(max_workers=workers,
+                                     initializer=_init_render_worker,
+                                     initargs=(template_html, template_css)) as ex:
+                # Sliding window: top up as each render finishes, so the pool
+                # never drains between batches and the executor doesn't track
+                # a work item per bill up front
+                todo = iter(tasks)
+                pending = {ex.submit(_render_one, t)
+                           for t in itertools.islice(todo, workers * RENDER_IN_FLIGHT_PER_WORKER)}
+                done_count = 0
+                while pending:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        fut.result()
+                        done_count += 1
+                        if done_count % 20 == 0:
+                            self._log(f"... {done_count}/{len(bills)} PDFs done")
+                        nxt = next(todo, None)
+                        if nxt is not None:
+                            pending.add(ex.submit(_render_one, nxt))
+
+            export_whatsapp_csv(bills, run_dir / "WhatsApp_Messages.csv")
+            export_summary_xlsx(bills, run_dir / "Summary.xlsx")
+
+            self._log_q.put(("done", (len(bills), run_dir)))
+        except Exception as e:
+            self._log_q.put(("error", f"{type(e).__name__}: {e}"))
 
 if __name__ == "__main__":
+    # Needed for the process pool in the frozen (PyInstaller) Windows build
+    multiprocessing.freeze_support()
     App().mainloop()
\ No newline at end of file
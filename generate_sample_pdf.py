@@ -5,6 +5,9 @@ import sys
 from pathlib import Path
 import datetime as dt
 
+from jinja2 import Template
+from weasyprint import CSS
+
 # Add current directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -27,7 +30,8 @@ sample_bill = Bill(
 
 # Read template
 template_path = Path("template_invoice.html")
-template_html = template_path.read_text(encoding='utf-8')
+template = Template(template_path.read_text(encoding='utf-8'))
+stylesheets = [CSS(filename="template_invoice.css")]
 
 # Generate PDF
 output_path = Path("SAMPLE_INVOICE_0.01CBM.pdf")
@@ -42,8 +46,8 @@ print(f"  Total CBM: {sample_bill.total_cbm}")
 print(f"  Total: ${sample_bill.total_usd:.2f}")
 print()
 
-render_pdf_for_bill(sample_bill, template_html, output_path, 
-                    invoice_no=invoice_no, invoice_date=invoice_date)
+render_pdf_for_bill(sample_bill, template, output_path, 
+                    invoice_no=invoice_no, invoice_date=invoice_date, stylesheets=stylesheets)
 
 print(f"✓ Sample PDF generated successfully: {output_path}")
 print()
@@ -0,0 +1,74 @@
+import dataclasses
+import pandas as pd
+from app import build_bills
+
+def make_rows():
+    # Same shape as load_and_prepare_rows output
+    return pd.DataFrame({
+        'CONTACT': ["540789320", "540789320", "201698812"],
+        'CUSTOMER_NAME': ['UNKNOWN', 'Christian', 'Tilly'],
+        'LOCATION': ['ACCRA GHANA', 'KUMASI', 'ACCRA GHANA'],
+        'TRACKING_NO': ['S987654321', 'S999888777', 'KK12345678'],
+        'CBM': [0.424, 0.14, 0.18],
+        'PRODUCT_DESCRIPTION': ['SHOES', 'SHOES', 'LEARNING MACHINE'],
+        'INVOICE_NO': [102, 103, 101],
+        'QTY': [1, 4, 1],
+        'RECEIVING_DATE': ['2025-01-01'] * 3,
+    })
+
+def test_build_bills_grouping():
+    bills = build_bills(make_rows(), rate_usd_per_cbm=240.0, other_cost_usd=0.0)
+    assert [b.customer_name for b in bills] == ["Christian", "Tilly"]
+
+    christian, tilly = bills
+    # First real name/location wins over the placeholders
+    assert christian.location == "KUMASI"
+    assert tilly.location == "ACCRA GHANA"
+    assert christian.total_cbm == 0.564
+    assert christian.breakdown_items == [
+        {"tracking_number": "S987654321", "quantity": 1, "cbm": 0.42},
+        {"tracking_number": "S999888777", "quantity": 4, "cbm": 0.14},
+    ]
+    assert christian.shipping_mark == "S987654321, S999888777"
+    assert christian.item_description == "5 CARTONS OF SHOES"
+    assert tilly.item_description == "1 CARTON OF LEARNING MACHINE"
+    print("PASS: build_bills groups rows per customer.")
+
+def test_build_bills_numeric_tracking():
+    # build_bills is also called directly (verify scripts), not only after the loader's str cast
+    df = make_rows()
+    df['TRACKING_NO'] = [123, 456, 789]
+    christian, tilly = build_bills(df, rate_usd_per_cbm=240.0, other_cost_usd=0.0)
+    assert christian.shipping_mark == "123, 456"
+    assert tilly.shipping_mark == "789"
+    assert [i["tracking_number"] for i in christian.breakdown_items] == ["123", "456"]
+    print("PASS: build_bills accepts non-string tracking numbers.")
+
+def test_build_bills_duplicate_index():
+    # e.g. pd.concat of two sheets' rows; one tracking number missing
+    df = make_rows()
+    df.loc[0, 'TRACKING_NO'] = None
+    christian, tilly = build_bills(pd.concat([df, df]), rate_usd_per_cbm=240.0, other_cost_usd=0.0)
+    assert christian.shipping_mark == "S999888777, S999888777"
+    assert tilly.shipping_mark == "KK12345678, KK12345678"
+    print("PASS: build_bills handles duplicate index labels.")
+
+def test_bill_totals_cannot_go_stale():
+    christian, _ = build_bills(make_rows(), rate_usd_per_cbm=240.0, other_cost_usd=0.0)
+    try:
+        christian.total_cbm = 1.0
+    except dataclasses.FrozenInstanceError:
+        pass
+    else:
+        raise AssertionError("Bill should be frozen")
+    # replace() goes through __post_init__ again, so derived fields follow
+    bigger = dataclasses.replace(christian, total_cbm=1.0)
+    assert bigger.total_usd == 240.0
+    assert bigger.render_context["total_usd_str"] == "$240.00"
+    print("PASS: Bill is frozen; derived totals stay in sync.")
+
+if __name__ == "__main__":
+    test_build_bills_grouping()
+    test_build_bills_numeric_tracking()
+    test_build_bills_duplicate_index()
+    test_bill_totals_cannot_go_stale()
@@ -0,0 +1,52 @@
+import math
+import re
+import tempfile
+from pathlib import Path
+
+from openpyxl import load_workbook
+
+from app import Bill, export_summary_xlsx, invoice_numbers, _SUMMARY_COLUMNS
+
+def make_bills():
+    return [
+        Bill(shipping_mark="S987654321, S999888777", customer_id="540789320",
+             customer_name="Christian", phone="540789320", location="KUMASI",
+             total_cbm=0.564, rate_usd_per_cbm=240.0, other_cost_usd=5.0,
+             item_description="5 CARTONS OF SHOES"),
+        Bill(shipping_mark="KK12345678", customer_id="201698812",
+             customer_name="Tilly", phone="201698812", location="ACCRA GHANA",
+             total_cbm=0.01, rate_usd_per_cbm=240.0, other_cost_usd=0.0,
+             item_description="1 CARTON OF LEARNING MACHINE"),
+    ]
+
+def test_export_summary_xlsx():
+    bills = make_bills()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "Summary.xlsx"
+        export_summary_xlsx(bills, path)
+        wb = load_workbook(path, read_only=True)
+        assert wb.sheetnames == ["Summary"]
+        rows = list(wb["Summary"].iter_rows(values_only=True))
+        wb.close()
+
+    assert list(rows[0]) == _SUMMARY_COLUMNS
+    assert len(rows) == 1 + len(bills)
+    # Text columns exact; numbers up to Excel's 15 significant digits
+    for row, expected in zip(rows[1:], [
+        ("S987654321, S999888777", "Christian", "540789320", 0.564, 240, 135.36, 5, 140),
+        ("KK12345678", "Tilly", "201698812", 0.01, 240, 3, 0, 3),
+    ]):
+        assert row[:3] == expected[:3]
+        assert all(math.isclose(a, b) for a, b in zip(row[3:], expected[3:]))
+    print("PASS: Summary.xlsx has the expected sheet, header and rows.")
+
+def test_invoice_numbers():
+    nos = invoice_numbers("2026")
+    batch = [next(nos) for _ in range(500)]
+    assert all(re.fullmatch(r"1C2026\d{8}", n) for n in batch)
+    assert len(set(batch)) == len(batch)
+    print("PASS: invoice numbers are 1C + year + 8 digits and unique within a run.")
+
+if __name__ == "__main__":
+    test_export_summary_xlsx()
+    test_invoice_numbers()
@@ -0,0 +1,60 @@
+import tempfile
+from pathlib import Path
+
+from openpyxl import Workbook
+
+from app import load_and_prepare_rows, build_bills
+
+HEADER = ['INVOICE N0.', 'TRACKING N0.', 'CONTACT', 'CUSTOMER NAME', 'LOCATION',
+          'QTY PER TRACKING', 'CBM PER TRACKING', 'PRODUCT DESCRIPTION', 'RECEIVING DATE']
+
+def write_sheet(path, header=HEADER):
+    # Same layout as the container lists: 3 info rows, header on row 4
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["1ST CONTAINER LIST"])
+    ws.append(["CONTAINER NO: TEST001"])
+    ws.append(["LOADING DATE: 2025-01-01"])
+    ws.append(header)
+    # CONTACT is numeric in Excel (one blank); tracking numbers have stray spaces
+    ws.append([101, '  S987654321 ', 540789320, 'Christian', 'KUMASI', '1pallet', 0.42, 'SHOES', '2025-01-01'])
+    ws.append([102, 'S999888777  ', 540789320, 'Christian', 'KUMASI', 4, 0.14, 'SHOES', '2025-01-01'])
+    ws.append([103, 'KK12345678', None, 'Tilly', None, None, 0.18, 'LEARNING MACHINE', '2025-01-01'])
+    ws.append([104, None, 201698812, 'No Tracking', None, 1, 0.5, 'BAGS', '2025-01-01'])
+    wb.save(path)
+
+def test_load_and_prepare_rows():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "rows.xlsx"
+        write_sheet(path)
+        df = load_and_prepare_rows(path)
+
+    # Row without a tracking number is dropped
+    assert len(df) == 3
+    # Numeric phones come back as text without a trailing ".0"; blanks become UNKNOWN
+    assert df['CONTACT'].tolist() == ["540789320", "540789320", "UNKNOWN"]
+    assert df['TRACKING_NO'].tolist() == ["S987654321", "S999888777", "KK12345678"]
+    assert df['QTY'].tolist() == [1, 4, 1]
+    assert df['LOCATION'].tolist() == ["KUMASI", "KUMASI", "ACCRA GHANA"]
+
+    christian = next(b for b in build_bills(df, rate_usd_per_cbm=240.0, other_cost_usd=0.0)
+                     if b.customer_name == "Christian")
+    assert christian.phone == "540789320"
+    assert christian.shipping_mark == "S987654321, S999888777"
+    print("PASS: load_and_prepare_rows reads phones as text and strips tracking numbers.")
+
+def test_load_and_prepare_rows_padded_headers():
+    # Headers typed with stray spaces must still be read as text
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "rows.xlsx"
+        write_sheet(path, header=[f"{h} " for h in HEADER])
+        df = load_and_prepare_rows(path)
+
+    assert df['CONTACT'].tolist() == ["540789320", "540789320", "UNKNOWN"]
+    assert df['TRACKING_NO'].tolist() == ["S987654321", "S999888777", "KK12345678"]
+    assert df['CBM'].tolist() == [0.42, 0.14, 0.18]
+    print("PASS: padded headers don't turn phones back into floats.")
+
+if __name__ == "__main__":
+    test_load_and_prepare_rows()
+    test_load_and_prepare_rows_padded_headers()
@@ -4,6 +4,9 @@ import sys
 from pathlib import Path
 import datetime as dt
 
+from jinja2 import Template
+from weasyprint import CSS
+
 # Add current directory to path to import app
 sys.path.append(str(Path.cwd()))
 
@@ -37,7 +40,8 @@ def verify():
     out_dir = Path("test_output")
     out_dir.mkdir(exist_ok=True)
     
-    template_html = Path("template_invoice.html").read_text(encoding="utf-8")
+    template = Template(Path("template_invoice.html").read_text(encoding="utf-8"))
+    stylesheets = [CSS(filename="template_invoice.css")]
     invoice_date = dt.datetime.now().strftime("%dTH %b, %Y").upper()
 
     for i, bill in enumerate(to_print):
@@ -46,7 +50,7 @@ def verify():
         safe_name = "".join([c for c in bill.customer_name if c.isalnum() or c in " -_"])
         out_pdf = out_dir / f"TEST_INVOICE_{safe_name}.pdf"
         
-        render_pdf_for_bill(bill, template_html, out_pdf, invoice_no, invoice_date)
+        render_pdf_for_bill(bill, template, out_pdf, invoice_no, invoice_date, stylesheets=stylesheets)
         print(f"Generated: {out_pdf}")
         
     print("Verification complete.")
@@ -2,6 +2,8 @@ import sys
 from pathlib import Path
 from app import load_and_prepare_rows, build_bills, render_pdf_for_bill
 import datetime as dt
+from jinja2 import Template
+from weasyprint import CSS
 
 def verify():
     excel_path = Path('1ST CONTAINER LIST.xlsx')
@@ -17,7 +19,8 @@ def verify():
     bills = build_bills(df, rate_usd_per_cbm=240, other_cost_usd=0)
     print(f"Generated {len(bills)} bills (Expect 2: Tilly, Christian)")
     
-    template_html = Path('template_invoice.html').read_text(encoding='utf-8')
+    template = Template(Path('template_invoice.html').read_text(encoding='utf-8'))
+    stylesheets = [CSS(filename='template_invoice.css')]
     invoice_date = dt.datetime.now().strftime("%dTH %b, %Y").upper()
     
     for bill in bills:
@@ -27,7 +30,7 @@ def verify():
         print(f"  Desc: {bill.item_description}")
         
         out_path = Path(f"TEST_NEW_{bill.customer_name.strip()}.pdf")
-        render_pdf_for_bill(bill, template_html, out_path, "INV-TEST", invoice_date)
+        render_pdf_for_bill(bill, template, out_path, "INV-TEST", invoice_date, stylesheets=stylesheets)
         print(f"  -> Generated {out_path}")
 
 if __name__ == "__main__":